@@ -17,135 +17,622 @@ Author: Generated for MDASRAR3440 repository
 """
 import argparse
 import io
-import sys
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import matplotlib
+
+matplotlib.use("Agg")  # headless; skips GUI backend detection
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from reportlab.lib import pagesizes, units
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.utils import ImageReader
-from reportlab.pdfgen import canvas
-from reportlab.platypus import (
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-    Table,
-    TableStyle,
-    Image,
-)
-from reportlab.lib import colors
+from pandas.tseries.frequencies import to_offset
+
+try:
+    import polars as pl
+except ImportError:  # optional: group_summary falls back to pandas
+    pl = None
 
 # -----------------------
 # Data processing helpers
 # -----------------------
-def read_data(path: Path, date_col: str = None):
-    """Read CSV into DataFrame, optionally parse date column."""
-    df = pd.read_csv(path)
+def _parquet_cache_path(path: Path) -> Path:
+    """Return the sibling Parquet cache path for a CSV (data.csv -> data.csv.parquet)."""
+    path = Path(path)
+    return path.with_name(path.name + ".parquet")
+
+
+def _read_csv(path: Path, use_cache: bool = True, usecols=None, dtype=None):
+    """Read the raw CSV, going through a Parquet cache when pyarrow is available.
+
+    The cache is reused only while it is newer than the CSV; otherwise the CSV
+    is parsed and the cache rewritten. The cache always holds every column
+    (Parquet reads only the requested ones back), so a cache-filling parse
+    ignores usecols. dtype is only applied by the fallback C engine. Cache
+    failures never abort the read.
+    """
+    cache = _parquet_cache_path(path)
+    if use_cache:
+        try:
+            if cache.exists() and cache.stat().st_mtime >= Path(path).stat().st_mtime:
+                return pd.read_parquet(cache, engine="pyarrow", columns=usecols)
+        except (ImportError, OSError, ValueError):
+            pass
+    try:
+        # no dtype here: with a dtype dict pandas' pyarrow path also casts
+        # integer-inferred columns with blanks and fails; read_data casts after
+        df = pd.read_csv(path, engine="pyarrow", usecols=None if use_cache else usecols)
+    except ImportError:
+        return pd.read_csv(path, usecols=usecols, dtype=dtype)
+    if use_cache:
+        try:
+            df.to_parquet(cache, engine="pyarrow", compression="snappy")
+        except (ImportError, OSError, ValueError):
+            pass
+        if usecols is not None:
+            df = df[usecols]
+    return df
+
+
+def read_data(path: Path, date_col: str = None, use_cache: bool = True, usecols=None, category_cols=None):
+    """Read CSV into DataFrame, optionally parse date column.
+
+    Uses the multithreaded pyarrow CSV engine when pyarrow is installed and
+    falls back to the default C engine otherwise. With pyarrow, the parsed
+    CSV is also cached as <input>.parquet for faster repeat runs.
+
+    usecols limits the frame to those columns (names missing from the CSV are
+    ignored) and category_cols are loaded as pandas categoricals, so grouping
+    on them works on the category codes.
+    """
+    if usecols is not None:
+        wanted = set(usecols)
+        usecols = [c for c in pd.read_csv(path, nrows=0).columns if c in wanted]
+    category_cols = [c for c in (category_cols or ()) if usecols is None or c in usecols]
+    df = _read_csv(path, use_cache=use_cache, usecols=usecols,
+                   dtype={c: "category" for c in category_cols} or None)
+    for col in category_cols:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
     if date_col and date_col in df.columns:
-        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+        if isinstance(df[date_col].dtype, pd.DatetimeTZDtype):
+            df[date_col] = _reparse_offset_dates(path, date_col, df[date_col])
+        elif not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+            df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
     return df
 
 
+def _reparse_offset_dates(path: Path, date_col: str, parsed: pd.Series) -> pd.Series:
+    """Re-parse an offset-timestamp column from the CSV text with pd.to_datetime.
+
+    Arrow normalizes "+05:00"-style timestamps to UTC, which moves local day
+    boundaries; pd.to_datetime keeps the original offset. Mixed offsets cannot
+    share one zone, so those keep Arrow's UTC column.
+    """
+    raw = pd.read_csv(path, usecols=[date_col], dtype={date_col: str})[date_col]
+    try:
+        return pd.to_datetime(raw, errors="coerce").set_axis(parsed.index)
+    except ValueError:
+        return parsed
+
+
+STAT_LABELS = ("count", "mean", "std", "min", "25%", "50% (median)", "75%", "max")
+QUARTILE_LABELS = ("25%", "50% (median)", "75%")
+
+
+def _format_stats(values, approx_quartiles=False):
+    """Pair STAT_LABELS with values formatted to two decimals in one vectorized call.
+
+    Passing values=None gives the rows for an empty column.
+    """
+    labels = STAT_LABELS
+    if approx_quartiles:
+        labels = tuple(f"{label} (approx.)" if label in QUARTILE_LABELS else label for label in labels)
+    if values is None:
+        return [(labels[0], "0.00")] + [(label, "-") for label in labels[1:]]
+    return list(zip(labels, np.char.mod("%.2f", np.asarray(values, dtype=np.float64)).tolist()))
+
+
 def summary_stats(df: pd.DataFrame, value_col: str):
-    """Return a dict of basic statistics for the numeric column."""
-    ser = pd.to_numeric(df[value_col], errors="coerce").dropna()
-    stats = {
-        "count": int(ser.count()),
-        "mean": float(ser.mean()) if not ser.empty else None,
-        "std": float(ser.std()) if not ser.empty else None,
-        "min": float(ser.min()) if not ser.empty else None,
-        "25%": float(ser.quantile(0.25)) if not ser.empty else None,
-        "50% (median)": float(ser.median()) if not ser.empty else None,
-        "75%": float(ser.quantile(0.75)) if not ser.empty else None,
-        "max": float(ser.max()) if not ser.empty else None,
-    }
-    return stats
+    """Return basic statistics for the (already numeric) value column.
+
+    The result is an ordered list of (label, formatted value) tuples, ready to
+    drop into the PDF table. Values are formatted to two decimals; statistics
+    that cannot be computed on an empty column are shown as "-".
+    """
+    arr = df[value_col].to_numpy(dtype=np.float64)
+    arr = arr[~np.isnan(arr)]
+    if arr.size == 0:
+        return _format_stats(None)
+    # one partition gives min / quartiles / max together
+    q = np.quantile(arr, [0.0, 0.25, 0.5, 0.75, 1.0])
+    # mean and std from one sum + one dot product; shifting by the median
+    # keeps sum(d*d) - sum(d)**2/n from cancelling when the mean is large
+    n = arr.size
+    d = arr - q[2]
+    s = d.sum()
+    mean = q[2] + s / n
+    std = math.sqrt(max(np.dot(d, d) - s * s / n, 0.0) / (n - 1)) if n > 1 else np.nan
+    return _format_stats([n, mean, std, q[0], q[1], q[2], q[3], q[4]])
 
 
 def group_summary(df: pd.DataFrame, group_col: str, value_col: str, top_n=10):
-    """Return aggregated summary by group_col."""
+    """Return aggregated summary by group_col.
+
+    Runs on polars' parallel hash aggregation when polars is installed,
+    otherwise factorizes the keys and sums with np.bincount.
+    """
     if group_col not in df.columns:
         return pd.DataFrame()
-    df[value_col] = pd.to_numeric(df[value_col], errors="coerce")
-    grouped = df.groupby(group_col)[value_col].agg(["count", "mean", "sum"]).reset_index()
-    grouped = grouped.sort_values("sum", ascending=False).head(top_n)
-    return grouped
+    if pl is not None:
+        lf = pl.from_pandas(df[[group_col, value_col]]).lazy()
+        return _polars_group_plan(lf, group_col, value_col, top_n).collect().to_pandas()
+    codes, uniques = pd.factorize(df[group_col], sort=False)
+    vals = df[value_col].to_numpy(dtype=np.float64)
+    # NaN keys factorize to -1; NaN values are skipped like groupby's count/sum
+    keep = (codes >= 0) & ~np.isnan(vals)
+    sums = np.bincount(codes[keep], weights=vals[keep], minlength=len(uniques))
+    counts = np.bincount(codes[keep], minlength=len(uniques))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    # select the top_n sums without sorting every group
+    top = np.arange(len(uniques))
+    if top_n < len(uniques):
+        top = np.argpartition(-sums, top_n)[:top_n]
+    top = top[np.argsort(-sums[top], kind="stable")]
+    return pd.DataFrame({
+        group_col: uniques.take(top),
+        "count": counts[top],
+        "mean": means[top],
+        "sum": sums[top],
+    })
+
+
+def _polars_group_plan(lf, group_col: str, value_col: str, top_n=10):
+    """Lazy polars equivalent of the pandas groupby in group_summary."""
+    return (
+        lf.filter(pl.col(group_col).is_not_null())
+        .group_by(group_col)
+        .agg([
+            pl.col(value_col).count().alias("count"),
+            pl.col(value_col).mean().alias("mean"),
+            pl.col(value_col).sum().alias("sum"),
+        ])
+        .sort("sum", descending=True, nulls_last=True)
+        .head(top_n)
+    )
+
+
+def _is_day_aligned(freq) -> bool:
+    """Return True if freq bins cover whole days, so daily sums can be resampled to it exactly.
+
+    Raises ValueError for a frequency string pandas does not understand.
+    """
+    offset = to_offset(freq)
+    if isinstance(offset, (pd.offsets.BusinessHour, pd.offsets.CustomBusinessHour)):
+        return False
+    try:
+        step = pd.Timedelta(offset)
+    except ValueError:
+        return True  # calendar offsets (D, W, ME, ...) fall on day boundaries
+    day = pd.Timedelta(days=1)
+    return step >= day and step % day == pd.Timedelta(0)
+
+
+# trailing UTC offset ("Z", "+05:00", "-0330") after a clock time
+_TZ_SUFFIX = r"(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)\s*(Z|[+-]\d{2}:?\d{2})$"
+
+
+def _polars_daily_plan(lf, date_expr, date_col: str, value_col: str):
+    """Lazy per-day sums of value_col, keyed by the (naive) day of date_expr."""
+    return (
+        lf.select(date_expr.dt.truncate("1d").alias(date_col), pl.col(value_col))
+        .drop_nulls()
+        .group_by(date_col)
+        .agg(pl.col(value_col).sum())
+    )
+
+
+def polars_aggregates(path: Path, date_col: str, group_col: str, value_col: str, freq="D", top_n=10):
+    """Compute (stats, grouped, timeseries) from one lazy polars scan of the CSV.
+
+    The plans share the scan and are materialized together with
+    pl.collect_all, so the CSV is tokenized once. Every column is scanned as
+    text (no schema inference to trip over a late "1.5" or "n/a") and the
+    value column is cast with strict=False, like pd.to_numeric(errors="coerce").
+
+    Values are summed into daily buckets in polars and the (small) daily
+    series is then resampled to freq in pandas, which keeps pandas' bin labels
+    and zero-filled gaps; freq must therefore be whole days (D, W, ME, ...);
+    sub-daily frequencies raise ValueError. Timestamps with a single UTC offset
+    are bucketed on local days and the series keeps that offset as its tz, as
+    pd.to_datetime would; mixed offsets fall back to UTC days.
+    """
+    if pl is None:
+        raise ImportError("polars is required for the polars engine")
+    if not _is_day_aligned(freq):
+        raise ValueError(f"freq {freq!r} is finer than a day; the polars engine buckets by day")
+    lf = pl.scan_csv(path, infer_schema=False)
+    schema = lf.collect_schema()
+    if value_col not in schema:
+        raise KeyError(value_col)
+    lf = lf.with_columns(pl.col(value_col).cast(pl.Float64, strict=False))
+
+    plans = {"stats": lf.select(value_col)}
+    if group_col in schema:
+        plans["grouped"] = _polars_group_plan(lf, group_col, value_col, top_n)
+    if date_col in schema:
+        text = pl.col(date_col)
+        # drop the offset to get local wall-clock times; the offsets themselves
+        # (at most two distinct ones are needed) decide the tz afterwards
+        local = text.str.replace(_TZ_SUFFIX, "${1}").str.to_datetime(strict=False)
+        plans["ts"] = _polars_daily_plan(lf, local, date_col, value_col)
+        plans["offsets"] = lf.select(text.str.extract(_TZ_SUFFIX, 2).alias("offset")).drop_nulls().unique().head(2)
+    frames = dict(zip(plans, (f.to_pandas() for f in pl.collect_all(list(plans.values())))))
+
+    stats = summary_stats(frames["stats"], value_col)
+    grouped = frames.get("grouped", pd.DataFrame())
+    ts = pd.DataFrame()
+    if "ts" in frames:
+        offsets = frames["offsets"]["offset"].tolist()
+        daily, tz = frames["ts"], None
+        if len(offsets) == 1:
+            tz = pd.Timestamp("2000-01-01T00:00:00" + offsets[0]).tz
+        elif len(offsets) > 1:
+            # mixed offsets can't share a local zone: bucket on UTC days (rare, so re-scan)
+            utc = text.str.to_datetime(strict=False, time_zone="UTC").dt.replace_time_zone(None)
+            daily, tz = _polars_daily_plan(lf, utc, date_col, value_col).collect().to_pandas(), "UTC"
+        index = pd.DatetimeIndex(daily[date_col], name=date_col)
+        if tz is not None:
+            index = index.tz_localize(tz)
+        ser = pd.Series(daily[value_col].to_numpy(), index=index)
+        ts = ser.sort_index().resample(freq).sum().fillna(0)
+    return stats, grouped, ts
+
+
+def _daily_bincount(dates: pd.Series, values: pd.Series) -> pd.Series:
+    """Daily sums via np.bincount over integer day offsets (same result as resample("D").sum())."""
+    idx = pd.DatetimeIndex(dates)
+    tz = idx.tz
+    if tz is not None:
+        # bucket on local wall-clock days, as resample does for tz-aware indexes
+        idx = idx.tz_localize(None)
+    days = idx.to_numpy().astype("datetime64[D]")
+    vals = values.to_numpy(dtype=np.float64)
+    keep = ~(np.isnat(days) | np.isnan(vals))
+    days, vals = days[keep], vals[keep]
+    if days.size == 0:
+        return pd.Series(dtype=np.float64, index=pd.DatetimeIndex([], name=dates.name, tz=tz))
+    first = days.min()
+    offsets = (days - first).astype(np.int64)
+    totals = np.bincount(offsets, weights=vals)
+    index = pd.date_range(pd.Timestamp(first), periods=len(totals), freq="D", name=dates.name, tz=tz)
+    return pd.Series(totals, index=index)
 
 
 def timeseries_aggregate(df: pd.DataFrame, date_col: str, value_col: str, freq="D"):
-    """Aggregate numeric values over time (resample by freq)."""
+    """Aggregate numeric values over time (resample by freq).
+
+    Expects date_col already parsed by read_data and value_col numeric.
+    """
     if date_col not in df.columns:
         return pd.DataFrame()
-    ts = df.set_index(pd.to_datetime(df[date_col], errors="coerce"))
-    ts[value_col] = pd.to_numeric(ts[value_col], errors="coerce")
-    agg = ts[value_col].resample(freq).sum().fillna(0)
+    if freq == "D":
+        return _daily_bincount(df[date_col], df[value_col])
+    # index a bare Series instead of set_index, which copies every column
+    ser = pd.Series(df[value_col].to_numpy(), index=pd.DatetimeIndex(df[date_col])).dropna()
+    agg = ser.resample(freq).sum().fillna(0)
     return agg
 
 
+QUANTILE_SAMPLE_SIZE = 100_000
+
+
+class _RunningStats:
+    """Summary statistics accumulated chunk by chunk in bounded memory.
+
+    count, mean, std, min and max are exact (running shifted sums); the
+    quartiles come from a uniform sample of at most sample_size values and are
+    only approximate once more values than that have been seen.
+    """
+
+    def __init__(self, sample_size=QUANTILE_SAMPLE_SIZE, seed=0):
+        self.sample_size = sample_size
+        self.n = 0
+        self.shift = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.lo = np.inf
+        self.hi = -np.inf
+        self._rng = np.random.default_rng(seed)
+        self._keys = np.empty(0)
+        self._sample = np.empty(0)
+
+    def update(self, arr: np.ndarray):
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return
+        if self.shift is None:
+            # shifting by a representative value keeps the sum-of-squares
+            # formula from cancelling when the mean is large
+            self.shift = float(arr[0])
+        d = arr - self.shift
+        self.n += arr.size
+        self.total += d.sum()
+        self.total_sq += np.dot(d, d)
+        self.lo = min(self.lo, arr.min())
+        self.hi = max(self.hi, arr.max())
+        # bottom-k on random keys keeps a uniform sample without replacement
+        keys = np.concatenate([self._keys, self._rng.random(arr.size)])
+        sample = np.concatenate([self._sample, arr])
+        if keys.size > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, sample = keys[keep], sample[keep]
+        self._keys, self._sample = keys, sample
+
+    def summary(self):
+        """Return the rows summary_stats would give, marking sampled quartiles as approximate."""
+        if self.n == 0:
+            return _format_stats(None)
+        n = self.n
+        mean = self.shift + self.total / n
+        std = math.sqrt(max(self.total_sq - self.total * self.total / n, 0.0) / (n - 1)) if n > 1 else np.nan
+        q = np.quantile(self._sample, [0.25, 0.5, 0.75])
+        return _format_stats([n, mean, std, self.lo, q[0], q[1], q[2], self.hi],
+                             approx_quartiles=n > self._sample.size)
+
+
+def stream_aggregates(path: Path, date_col: str, group_col: str, value_col: str, freq="D", top_n=10,
+                      chunksize=1_000_000):
+    """Compute (stats, grouped, timeseries) by streaming the CSV in chunks.
+
+    Only running per-group (count, sum), per-day sums and _RunningStats are
+    carried between chunks, so memory is bounded by the number of groups and
+    days rather than rows; the quartiles are approximate for inputs with more
+    than QUANTILE_SAMPLE_SIZE values. The daily sums are resampled to freq at
+    the end, so freq must be whole days (D, W, ME, ...); sub-daily
+    frequencies raise ValueError.
+    """
+    if not _is_day_aligned(freq):
+        raise ValueError(f"freq {freq!r} is finer than a day; streaming aggregates by day")
+    header = pd.read_csv(path, nrows=0).columns
+    if value_col not in header:
+        raise KeyError(value_col)
+    has_group, has_date = group_col in header, date_col in header
+    usecols = [c for c in header if c in {date_col, group_col, value_col}]
+
+    running = _RunningStats()
+    groups = None
+    daily = None
+    # read keys as text so a chunk of int-looking keys can't split a group
+    # into int and str halves when merged with a mixed chunk
+    dtype = {group_col: str} if has_group else None
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize, dtype=dtype):
+        vals = pd.to_numeric(chunk[value_col], errors="coerce")
+        running.update(vals.to_numpy(dtype=np.float64))
+        if has_group:
+            part = vals.groupby(chunk[group_col]).agg(["count", "sum"])
+            groups = part if groups is None else groups.add(part, fill_value=0)
+        if has_date:
+            part = _daily_bincount(pd.to_datetime(chunk[date_col], errors="coerce"), vals)
+            if not part.empty:
+                daily = part if daily is None else daily.add(part, fill_value=0)
+
+    stats = running.summary()
+
+    grouped = pd.DataFrame()
+    if groups is not None:
+        groups["count"] = groups["count"].astype(np.int64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            groups["mean"] = groups["sum"] / groups["count"]
+        grouped = (groups[["count", "mean", "sum"]]
+                   .sort_values("sum", ascending=False)
+                   .head(top_n)
+                   .rename_axis(group_col)
+                   .reset_index())
+
+    ts = pd.DataFrame() if daily is None else daily.resample(freq).sum().fillna(0)
+    return stats, grouped, ts
+
+
 # -----------------------
 # Figure creation
 # -----------------------
-def plot_timeseries(series: pd.Series, out_path: Path, title: str = "Time series"):
-    """Plot time series and save to out_path (PNG)."""
-    plt.figure(figsize=(10, 4))
-    if series.index.dtype == "datetime64[ns]":
-        plt.plot(series.index, series.values, marker="o", linewidth=1)
-        plt.gcf().autofmt_xdate()
+def _prepare_axes(ax, figsize):
+    """Return (fig, ax, owned): reuse and clear the given axes, or open a new figure."""
+    if ax is None:
+        fig, ax = plt.subplots(figsize=figsize)
+        return fig, ax, True
+    fig = ax.figure
+    ax.cla()
+    fig.set_size_inches(*figsize)
+    return fig, ax, False
+
+
+def _save_figure(fig, out_path, owned, **savefig_kwargs):
+    """Save fig as PNG to out_path, or to a rewound BytesIO when out_path is None.
+
+    Returns out_path or the buffer, and closes fig if the helper created it.
+    """
+    target = io.BytesIO() if out_path is None else out_path
+    # zlib level 1: the PNGs only live until the PDF is built, so trade
+    # a slightly larger file for a much cheaper DEFLATE pass
+    fig.savefig(target, format="png", pil_kwargs={"compress_level": 1}, **savefig_kwargs)
+    if owned:
+        plt.close(fig)
+    if out_path is None:
+        target.seek(0)
+    return target
+
+
+def plot_timeseries(series: pd.Series, out_path: Path = None, title: str = "Time series", ax=None):
+    """Plot time series and save to out_path (PNG), or to a returned BytesIO if out_path is None.
+
+    Pass ax to reuse an existing figure.
+    """
+    fig, ax, owned = _prepare_axes(ax, (10, 4))
+    # plain contiguous ndarrays keep matplotlib on its fast conversion path
+    values = series.to_numpy(dtype=np.float64)
+    if pd.api.types.is_datetime64_any_dtype(series.index):
+        ax.plot(series.index.to_numpy(), values, marker="o", linewidth=1)
+        fig.autofmt_xdate()
     else:
-        plt.plot(series.values, marker="o", linewidth=1)
-    plt.title(title)
-    plt.xlabel("Date")
-    plt.ylabel("Value")
-    plt.grid(True, linestyle="--", linewidth=0.5, alpha=0.7)
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=150)
-    plt.close()
-
-
-def plot_bar(df_grouped: pd.DataFrame, out_path: Path, label_col: str = None, value_col: str = "sum", title="By category"):
-    """Plot a bar chart for grouped data frame with label_col and value_col."""
-    plt.figure(figsize=(8, 4))
+        ax.plot(values, marker="o", linewidth=1)
+    ax.set_title(title)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Value")
+    ax.grid(True, linestyle="--", linewidth=0.5, alpha=0.7)
+    fig.tight_layout()
+    return _save_figure(fig, out_path, owned, dpi=150)
+
+
+def plot_placeholder(out_path: Path, text: str, ax=None):
+    """Save a blank figure with a centered message to out_path (PNG) or a returned BytesIO."""
+    fig, ax, owned = _prepare_axes(ax, (8, 3))
+    ax.text(0.5, 0.5, text, ha="center", va="center")
+    ax.axis("off")
+    fig.tight_layout()
+    return _save_figure(fig, out_path, owned)
+
+
+def plot_bar(df_grouped: pd.DataFrame, out_path: Path = None, label_col: str = None, value_col: str = "sum", title="By category", ax=None):
+    """Plot a bar chart for grouped data frame with label_col and value_col.
+
+    Saves to out_path (PNG), or to a returned BytesIO if out_path is None.
+    """
+    fig, ax, owned = _prepare_axes(ax, (8, 4))
+    ax.axis("on")
     if df_grouped.empty:
         # blank placeholder figure
-        plt.text(0.5, 0.5, "No data", ha="center", va="center")
+        ax.text(0.5, 0.5, "No data", ha="center", va="center")
     else:
-        labels = df_grouped[label_col].astype(str).tolist()
-        values = df_grouped[value_col].tolist()
-        plt.bar(range(len(labels)), values)
-        plt.xticks(range(len(labels)), labels, rotation=45, ha="right")
-    plt.title(title)
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=150)
-    plt.close()
+        labels = df_grouped[label_col].astype(str).to_numpy()
+        values = np.ascontiguousarray(df_grouped[value_col].to_numpy(dtype=np.float64))
+        ax.bar(range(len(labels)), values)
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=45, ha="right")
+    ax.set_title(title)
+    fig.tight_layout()
+    return _save_figure(fig, out_path, owned, dpi=150)
 
 
 # -----------------------
 # PDF generation
 # -----------------------
+PAGE_MARGIN = 36
+
+
+def _format_table_cells(df: pd.DataFrame) -> np.ndarray:
+    """Stringify df column by column: numeric columns as fixed "%.2f" (like the
+    stats table, "-" for NaN), everything else with str()."""
+    columns = []
+    for col in df.columns:
+        ser = df[col]
+        if pd.api.types.is_numeric_dtype(ser) and not pd.api.types.is_bool_dtype(ser):
+            arr = ser.to_numpy(dtype=np.float64)
+            columns.append(np.where(np.isnan(arr), "-", np.char.mod("%.2f", arr)))
+        else:
+            columns.append(ser.astype(str).to_numpy(dtype=object))
+    return np.column_stack(columns) if columns else np.empty((len(df), 0), dtype=object)
+
+
+@lru_cache(maxsize=None)
+def _report_styles():
+    """Build the paragraph and table styles once per process.
+
+    Kept behind a cached function rather than at module level so reportlab
+    is still only imported when a PDF is actually built.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.platypus import TableStyle
+
+    sheet = getSampleStyleSheet()
+    header_and_grid = [("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                       ("GRID", (0, 0), (-1, -1), 0.5, colors.grey)]
+    return {
+        "sheet": sheet,
+        "title": ParagraphStyle("TitleStyle", parent=sheet["Title"], fontSize=24, alignment=1, spaceAfter=12),
+        "subtitle": ParagraphStyle("Subtitle", parent=sheet["Normal"], fontSize=12, alignment=1, spaceAfter=6),
+        "stats_table": TableStyle(header_and_grid + [("ALIGN", (1, 1), (-1, -1), "RIGHT")]),
+        "group_table": TableStyle(header_and_grid),
+    }
+
+
+def _draw_flowables(c, flowables, pagesize):
+    """Stack flowables top-down on canvas c, starting a new page when one doesn't fit.
+
+    A fixed single-column stand-in for SimpleDocTemplate.build: no frames or
+    page templates. A flowable that overflows the space left on the page is
+    split there when it supports it (tables repeat their header rows);
+    otherwise it moves to a new page. Raises ValueError for a flowable that
+    cannot be split and is taller than a whole page.
+    """
+    page_w, page_h = pagesize
+    avail_w = page_w - 2 * PAGE_MARGIN
+    avail_h = page_h - 2 * PAGE_MARGIN
+    top = page_h - PAGE_MARGIN
+    y = top
+    pending = list(flowables)
+    while pending:
+        fl = pending.pop(0)
+        w, h = fl.wrapOn(c, avail_w, avail_h)
+        before = fl.getSpaceBefore() if y < top else 0
+        space = y - before - PAGE_MARGIN
+        if h > space:
+            parts = fl.splitOn(c, avail_w, space)
+            if len(parts) > 1:
+                pending[:0] = parts
+                continue
+            if y == top:
+                raise ValueError(f"{type(fl).__name__} is {h:.0f}pt tall and cannot be split "
+                                 f"to fit a {avail_h:.0f}pt page")
+            c.showPage()
+            y = top
+            pending.insert(0, fl)
+            continue
+        y -= before + h
+        fl.drawOn(c, PAGE_MARGIN, y, _sW=avail_w - w)
+        y -= fl.getSpaceAfter()
+    c.showPage()
+    c.save()
+
+
 def build_pdf(output_path: Path, context: dict):
     """
-    Create a PDF report using reportlab's SimpleDocTemplate + platypus.
+    Create a PDF report by placing platypus flowables directly on a canvas.
     context keys:
       - title, subtitle, generated_on (str)
       - source_info (str)
-      - stats (dict)
+      - stats (list of (label, formatted value) tuples from summary_stats,
+        or a dict of label -> number/None)
       - grouped_df (pd.DataFrame)
-      - timeseries_plot (Path)
-      - bar_plot (Path)
+      - timeseries_plot (Path or PNG BytesIO)
+      - bar_plot (Path or PNG BytesIO)
     """
-    doc = SimpleDocTemplate(str(output_path), pagesize=A4, rightMargin=36, leftMargin=36, topMargin=36, bottomMargin=36)
+    # reportlab is imported here so CLI parsing and the data helpers don't
+    # pay its import cost
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from reportlab.platypus import (
+        Paragraph,
+        Spacer,
+        Table,
+        Image,
+        LongTable,
+    )
+
     story = []
-    styles = getSampleStyleSheet()
+    cached = _report_styles()
+    styles = cached["sheet"]
 
     # Title page
-    title_style = ParagraphStyle("TitleStyle", parent=styles["Title"], fontSize=24, alignment=1, spaceAfter=12)
-    story.append(Paragraph(context.get("title", "Automated Report"), title_style))
-    subtitle_style = ParagraphStyle("Subtitle", parent=styles["Normal"], fontSize=12, alignment=1, spaceAfter=6)
-    story.append(Paragraph(context.get("subtitle", ""), subtitle_style))
+    story.append(Paragraph(context.get("title", "Automated Report"), cached["title"]))
+    story.append(Paragraph(context.get("subtitle", ""), cached["subtitle"]))
     story.append(Spacer(1, 12))
     story.append(Paragraph(f"Generated on: {context.get('generated_on')}", styles["Normal"]))
     story.append(Paragraph(f"Source: {context.get('source_info', '')}", styles["Normal"]))
@@ -153,15 +640,13 @@ def build_pdf(output_path: Path, context: dict):
 
     # Summary statistics table
     story.append(Paragraph("Summary statistics", styles["Heading2"]))
-    stats = context.get("stats", {})
+    stats = context.get("stats", [])
+    if isinstance(stats, dict):
+        stats = [(str(k), "-" if v is None else format(v, ".2f")) for k, v in stats.items()]
     if stats:
-        stat_rows = [["Metric", "Value"]]
-        for k, v in stats.items():
-            stat_rows.append([str(k), f"{v:.2f}" if isinstance(v, (int, float)) else str(v)])
+        stat_rows = [["Metric", "Value"], *stats]
         tbl = Table(stat_rows, hAlign="LEFT", colWidths=[150, 150])
-        tbl.setStyle(TableStyle([("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                                 ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                                 ("ALIGN", (1, 1), (-1, -1), "RIGHT")]))
+        tbl.setStyle(cached["stats_table"])
         story.append(tbl)
     else:
         story.append(Paragraph("No numeric summary available.", styles["Normal"]))
@@ -173,10 +658,9 @@ def build_pdf(output_path: Path, context: dict):
     if gdf is not None and not gdf.empty:
         # limit number of columns and rows for PDF
         cols = gdf.columns.tolist()
-        data = [cols] + gdf.head(20).values.tolist()
-        tbl = Table(data, hAlign="LEFT")
-        tbl.setStyle(TableStyle([("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                                 ("GRID", (0, 0), (-1, -1), 0.5, colors.grey)]))
+        data = [cols] + _format_table_cells(gdf.head(20)).tolist()
+        tbl = LongTable(data, hAlign="LEFT", repeatRows=1)
+        tbl.setStyle(cached["group_table"])
         story.append(tbl)
     else:
         story.append(Paragraph("No grouping data available.", styles["Normal"]))
@@ -185,18 +669,18 @@ def build_pdf(output_path: Path, context: dict):
     # Add figures if exist
     for fig_label in ("timeseries_plot", "bar_plot"):
         fpath = context.get(fig_label)
-        if fpath and Path(fpath).exists():
+        if isinstance(fpath, io.BytesIO) or (fpath and Path(fpath).exists()):
             story.append(Paragraph(fig_label.replace("_", " ").title(), styles["Heading3"]))
             # Insert image with max width set to page width minus margins
-            img = Image(str(fpath))
-            max_width = A4[0] - doc.leftMargin - doc.rightMargin
+            img = Image(fpath if isinstance(fpath, io.BytesIO) else str(fpath))
+            max_width = A4[0] - 2 * PAGE_MARGIN
             if img.drawWidth > max_width:
-                img.drawWidth = max_width
                 img.drawHeight = img.drawHeight * (max_width / img.drawWidth)
+                img.drawWidth = max_width
             story.append(img)
             story.append(Spacer(1, 12))
 
-    doc.build(story)
+    _draw_flowables(canvas.Canvas(str(output_path), pagesize=A4), story, A4)
 
 
 # -----------------------
@@ -211,48 +695,82 @@ def main(argv=None):
     parser.add_argument("--value-col", default="value", help="Numeric value column name")
     parser.add_argument("--freq", default="D", help="Timeseries resample frequency (D, W, M)")
     parser.add_argument("--top-n", type=int, default=10, help="Number of top groups to show")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the <input>.parquet cache")
+    parser.add_argument("--engine", choices=("pandas", "polars"), default="pandas",
+                        help="Aggregation engine; polars scans the CSV once lazily (needs polars, freq of D or coarser)")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Stream the CSV in chunks of this many rows to bound memory (pandas engine, freq of D or coarser)")
     args = parser.parse_args(argv)
+    if args.engine == "polars" and pl is None:
+        parser.error("--engine polars requires the polars package")
+    if args.chunksize is not None and (args.engine != "pandas" or args.chunksize <= 0):
+        parser.error("--chunksize must be positive and only applies to the pandas engine")
+    if args.engine == "polars" or args.chunksize is not None:
+        # both aggregate by day first and resample afterwards
+        mode = "--engine polars" if args.engine == "polars" else "--chunksize"
+        try:
+            day_aligned = _is_day_aligned(args.freq)
+        except ValueError:
+            parser.error(f"invalid --freq {args.freq!r}")
+        if not day_aligned:
+            parser.error(f"--freq {args.freq!r} is finer than a day; {mode} needs D or coarser")
 
     inp = Path(args.input)
     out = Path(args.output)
     workdir = out.parent
     workdir.mkdir(parents=True, exist_ok=True)
 
-    # Read
-    print(f"Reading {inp} ...")
-    df = read_data(inp, date_col=args.date_col)
-
-    # Stats
-    print("Calculating summary statistics ...")
-    stats = summary_stats(df, args.value_col)
-
-    # Grouping
-    print(f"Computing group summary by '{args.group_col}' ...")
-    grouped = group_summary(df, args.group_col, args.value_col, top_n=args.top_n)
-
-    # Timeseries
-    print(f"Aggregating timeseries by '{args.date_col}' freq='{args.freq}' ...")
-    ts = timeseries_aggregate(df, args.date_col, args.value_col, freq=args.freq)
-
-    # Create plots
-    timeseries_png = workdir / "timeseries.png"
-    bar_png = workdir / "bar.png"
-
+    if args.engine == "polars":
+        print(f"Scanning {inp} and aggregating with polars ...")
+        stats, grouped, ts = polars_aggregates(inp, args.date_col, args.group_col, args.value_col,
+                                               freq=args.freq, top_n=args.top_n)
+    elif args.chunksize:
+        print(f"Streaming {inp} in chunks of {args.chunksize} rows ...")
+        stats, grouped, ts = stream_aggregates(inp, args.date_col, args.group_col, args.value_col,
+                                               freq=args.freq, top_n=args.top_n, chunksize=args.chunksize)
+    else:
+        # Read
+        print(f"Reading {inp} ...")
+        df = read_data(inp, date_col=args.date_col, use_cache=not args.no_cache,
+                       usecols=[args.date_col, args.group_col, args.value_col],
+                       category_cols=[args.group_col])
+        # coerce the value column once here; the helpers below expect it numeric
+        df[args.value_col] = pd.to_numeric(df[args.value_col], errors="coerce")
+
+        # Stats
+        print("Calculating summary statistics ...")
+        stats = summary_stats(df, args.value_col)
+
+        # Grouping
+        print(f"Computing group summary by '{args.group_col}' ...")
+        grouped = group_summary(df, args.group_col, args.value_col, top_n=args.top_n)
+
+        # Timeseries
+        print(f"Aggregating timeseries by '{args.date_col}' freq='{args.freq}' ...")
+        ts = timeseries_aggregate(df, args.date_col, args.value_col, freq=args.freq)
+
+    # Create plots in memory. The two charts are independent, so on multi-core
+    # machines render them in separate processes (matplotlib's Python-side
+    # setup holds the GIL); on a single core the pool only adds overhead, so
+    # render them inline on one shared Figure instead.
     if not ts.empty:
-        print(f"Plotting timeseries -> {timeseries_png}")
-        plot_timeseries(ts, timeseries_png, title=f"Timeseries ({args.value_col})")
+        print("Plotting timeseries ...")
+        ts_job = (plot_timeseries, (ts,), {"title": f"Timeseries ({args.value_col})"})
     else:
         # Create empty placeholder
         print("No timeseries data; creating placeholder timeseries figure.")
-        plt.figure(figsize=(8, 3))
-        plt.text(0.5, 0.5, "No time series data", ha="center", va="center")
-        plt.axis("off")
-        plt.tight_layout()
-        plt.savefig(timeseries_png)
-        plt.close()
-
-    print(f"Plotting bar chart -> {bar_png}")
-    plot_bar(grouped, bar_png, label_col=args.group_col, value_col="sum", title="Top groups by sum")
+        ts_job = (plot_placeholder, (None, "No time series data"), {})
+    print("Plotting bar chart ...")
+    bar_job = (plot_bar, (grouped,), {"label_col": args.group_col, "value_col": "sum", "title": "Top groups by sum"})
+
+    if (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(fn, *fargs, **fkwargs) for fn, fargs, fkwargs in (ts_job, bar_job)]
+            timeseries_png, bar_png = [f.result() for f in futures]
+    else:
+        fig, ax = plt.subplots()
+        timeseries_png, bar_png = [fn(*fargs, ax=ax, **fkwargs) for fn, fargs, fkwargs in (ts_job, bar_job)]
+        plt.close(fig)
 
     # Build PDF
     context = {
@@ -262,8 +780,8 @@ def main(argv=None):
         "source_info": str(inp),
         "stats": stats,
         "grouped_df": grouped,
-        "timeseries_plot": str(timeseries_png),
-        "bar_plot": str(bar_png),
+        "timeseries_plot": timeseries_png,
+        "bar_plot": bar_png,
     }
     print(f"Building PDF -> {out} ...")
     build_pdf(out, context)
@@ -0,0 +1,92 @@
+"""The pandas, polars and streaming aggregation paths must produce the same report data."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import generate_report as gr
+
+HEADER = "date,category,value,zip\n"
+
+
+def _rows_blank_cells():
+    rows = [f"2025-01-{1 + i % 20:02d},{'ABCD'[i % 4]},{i % 9},{10000 + i}" for i in range(60)]
+    rows[3] = "2025-01-04,B,,"           # blank value and blank unused int
+    rows[10] = "2025-01-11,,5,10010"     # blank group key
+    rows[17] = ",C,7,10017"              # blank date
+    return rows
+
+
+def _rows_late_type_change():
+    # int-looking value and group columns that turn non-int after row 100
+    rows = [f"2025-02-{1 + i % 28:02d},{i % 5},{i % 7},{i}" for i in range(200)]
+    rows[150] = "2025-02-11,3,1.5,150"
+    rows[160] = "2025-02-21,X,n/a,160"
+    rows[170] = "2025-02-03,X,4,170"
+    return rows
+
+
+def _rows_offset_timestamps():
+    return [f"2025-03-{1 + i % 10:02d}T{(i * 5) % 24:02d}:30:00+05:00,{'PQR'[i % 3]},{i % 4 + 1},{i}"
+            for i in range(50)]
+
+
+def _rows_mixed_keys():
+    # chunks of int-looking keys followed by a chunk that mixes in text keys
+    rows = [f"2025-04-{1 + i % 5:02d},{i % 4},{i % 3 + 1},{i}" for i in range(40)]
+    rows += [f"2025-04-06,{k},2,{i}" for i, k in enumerate(["0", "1", "x", "y", "2", "3"])]
+    return rows
+
+
+CASES = {
+    "blank_cells": _rows_blank_cells,
+    "late_type_change": _rows_late_type_change,
+    "offset_timestamps": _rows_offset_timestamps,
+    "mixed_keys": _rows_mixed_keys,
+}
+
+
+def _pandas_engine(path, freq, use_polars_groupby):
+    df = gr.read_data(path, date_col="date", use_cache=False,
+                      usecols=["date", "category", "value"], category_cols=["category"])
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    saved, gr.pl = gr.pl, (gr.pl if use_polars_groupby else None)
+    try:
+        grouped = gr.group_summary(df, "category", "value", top_n=100)
+    finally:
+        gr.pl = saved
+    return (gr.summary_stats(df, "value"), grouped,
+            gr.timeseries_aggregate(df, "date", "value", freq=freq))
+
+
+def _normalize_grouped(grouped):
+    out = pd.DataFrame({
+        "category": grouped["category"].astype(str).to_numpy(),
+        "count": grouped["count"].to_numpy(dtype=np.int64),
+        "mean": grouped["mean"].to_numpy(dtype=np.float64),
+        "sum": grouped["sum"].to_numpy(dtype=np.float64),
+    })
+    return out.sort_values("category").reset_index(drop=True)
+
+
+def _engines(path, freq):
+    yield "pandas/bincount", _pandas_engine(path, freq, use_polars_groupby=False)
+    if gr.pl is not None:
+        yield "pandas/polars-groupby", _pandas_engine(path, freq, use_polars_groupby=True)
+        yield "polars", gr.polars_aggregates(path, "date", "category", "value", freq=freq, top_n=100)
+    yield "stream", gr.stream_aggregates(path, "date", "category", "value", freq=freq, top_n=100, chunksize=7)
+
+
+@pytest.mark.parametrize("freq", ["D", "W"])
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_engines_agree(tmp_path, case, freq):
+    path = tmp_path / f"{case}.csv"
+    path.write_text(HEADER + "\n".join(CASES[case]()) + "\n")
+
+    (ref_name, (ref_stats, ref_grouped, ref_ts)), *others = list(_engines(path, freq))
+    ref_grouped = _normalize_grouped(ref_grouped)
+    for name, (stats, grouped, ts) in others:
+        assert stats == ref_stats, name
+        pd.testing.assert_frame_equal(_normalize_grouped(grouped), ref_grouped, obj=f"{name} grouped")
+        assert ts.index.equals(ref_ts.index), name
+        assert str(ts.index.tz) == str(ref_ts.index.tz), name
+        np.testing.assert_allclose(ts.to_numpy(), ref_ts.to_numpy(), err_msg=name)
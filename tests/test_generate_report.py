@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+import generate_report as gr
+
+
+def write_csv(tmp_path, text, name="data.csv"):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_read_data_blank_cells_in_int_columns(tmp_path, use_cache):
+    # blank in the used value column and in an unused int column
+    path = write_csv(tmp_path, "date,category,value,zip\n"
+                               "2025-01-01,A,1,100\n"
+                               "2025-01-02,B,,\n"
+                               "2025-01-03,A,3,300\n")
+    df = gr.read_data(path, date_col="date", use_cache=use_cache,
+                      usecols=["date", "category", "value"], category_cols=["category"])
+    assert list(df.columns) == ["date", "category", "value"]
+    assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+    assert df["value"].isna().tolist() == [False, True, False]
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_read_data_keeps_timestamp_offsets(tmp_path, use_cache):
+    path = write_csv(tmp_path, "date,category,value\n"
+                               "2025-03-01T01:00:00+05:00,A,1\n"
+                               "2025-03-01T02:00:00+05:00,A,4\n"
+                               "2025-03-02T03:00:00+05:00,B,2\n")
+    for _ in range(2):  # second pass reads the Parquet cache when enabled
+        df = gr.read_data(path, date_col="date", use_cache=use_cache)
+        assert str(df["date"].dt.tz) == "UTC+05:00"
+        ts = gr.timeseries_aggregate(df, "date", "value", freq="D")
+        assert ts.index[0] == pd.Timestamp("2025-03-01", tz="UTC+05:00")
+        assert ts.tolist() == [5.0, 2.0]
+
+
+@pytest.mark.skipif(gr.pl is None, reason="polars not installed")
+def test_polars_engine_survives_late_type_changes_and_keeps_offsets(tmp_path):
+    rows = [f"2025-03-{1 + i % 28:02d}T01:00:00+05:00,{i % 7},{i % 5}" for i in range(700)]
+    rows[500] = "2025-03-05T01:00:00+05:00,3,n/a"
+    rows[550] = "2025-03-05T01:00:00+05:00,3,1.5"
+    rows[600] = "2025-03-05T01:00:00+05:00,X,2"
+    path = write_csv(tmp_path, "date,category,value\n" + "\n".join(rows) + "\n")
+    stats, grouped, ts = gr.polars_aggregates(path, "date", "category", "value")
+    assert dict(stats)["count"] == "699.00"
+    assert "X" in grouped["category"].tolist()
+    assert str(ts.index.tz) == "UTC+05:00"
+    assert ts.index[0] == pd.Timestamp("2025-03-01", tz="UTC+05:00")
+
+
+def test_stream_aggregates_keeps_group_keys_stable_across_chunks(tmp_path):
+    rows = [f"2025-03-01,{i % 3},1" for i in range(30)] + [f"2025-03-02,{k},1" for k in ("0", "1", "2", "X")]
+    path = write_csv(tmp_path, "date,category,value\n" + "\n".join(rows) + "\n")
+    _, grouped, _ = gr.stream_aggregates(path, "date", "category", "value", chunksize=10)
+    counts = dict(zip(grouped["category"].astype(str), grouped["count"]))
+    assert counts == {"0": 11, "1": 11, "2": 11, "X": 1}
+
+
+def test_group_table_cells_use_fixed_two_decimals():
+    df = pd.DataFrame({"category": ["A", "B"], "count": [3, 0],
+                       "mean": [99.1, float("nan")], "sum": [1.5e9, 0.0]})
+    assert gr._format_table_cells(df).tolist() == [
+        ["A", "3.00", "99.10", "1500000000.00"],
+        ["B", "0.00", "-", "0.00"],
+    ]